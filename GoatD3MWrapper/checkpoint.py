@@ -0,0 +1,85 @@
+import os
+import collections
+import hashlib
+import json
+import logging
+
+# Checkpoint journal helper class
+class GeocodingJournal:
+    """
+    Append-only on-disk journal of geocoded rows, so that an interrupted produce call
+    can be resumed. Each line is a JSON record holding a contiguous run of results for
+    one target column: {"column": i, "start": j, "values": [...]}. Records are buffered
+    and written every `interval` rows; a partially written trailing record left by a
+    crash is discarded (and truncated away) on load, and corrupt records are skipped.
+    """
+    def __init__(self, directory, fingerprint, interval):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, fingerprint + '.journal')
+        self.interval = interval
+        self.column = None
+        self.start = None
+        self.values = []
+
+    def load(self):
+        # returns {column: {row: value}} of results completed by previous runs
+        done = collections.defaultdict(dict)
+        if not os.path.exists(self.path):
+            return done
+        good_offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                # a record without its newline was cut off mid-write, so drop it
+                # before appending, otherwise the next record would be merged into it
+                if not line.endswith(b'\n'):
+                    break
+                good_offset += len(line)
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    logging.warning(f'Skipping corrupt record in checkpoint journal {self.path}')
+                    continue
+                for offset, value in enumerate(record['values']):
+                    done[record['column']][record['start'] + offset] = value
+        if good_offset != os.path.getsize(self.path):
+            logging.debug(f'Discarding incomplete trailing record in checkpoint journal {self.path}')
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_offset)
+        return done
+
+    def record(self, column, row, value):
+        # extend the current run if contiguous, otherwise start a new one
+        if self.values and (column != self.column or row != self.start + len(self.values)):
+            self.flush()
+        if not self.values:
+            self.column = column
+            self.start = row
+        self.values.append(value)
+        if len(self.values) >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if not self.values:
+            return
+        line = json.dumps({'column': self.column, 'start': self.start, 'values': self.values})
+        with open(self.path, 'a') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.values = []
+
+    def finish(self):
+        # job completed, journal no longer needed
+        self.values = []
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def journal_fingerprint(columns, params):
+    # fingerprint of input column values and result-affecting hyperparameters, used as journal key
+    digest = hashlib.sha1()
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+    for name, values in columns:
+        digest.update(('\x1e' + str(name)).encode('utf-8'))
+        for value in values:
+            digest.update(('\x1f' + str(value)).encode('utf-8'))
+    return digest.hexdigest()
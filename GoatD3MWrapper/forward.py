@@ -18,6 +18,7 @@ from d3m.metadata import hyperparams, base as metadata_base
 from d3m.container import DataFrame as d3m_DataFrame
 from d3m.container import List as d3m_List
 from common_primitives import utils as utils_cp
+from .checkpoint import GeocodingJournal, journal_fingerprint
 
 
 __author__ = 'Distil'
@@ -80,6 +81,13 @@ class Hyperparams(hyperparams.Hyperparams):
         default=(),
         semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
         description='indices of column with geolocation formatted as text that should be converted to lat,lon pairs')
+    checkpoint_dir = hyperparams.Hyperparameter[typing.Union[str, None]](
+        default=None,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='directory in which to journal completed rows, so that an interrupted produce call can be resumed; disabled if None')
+    checkpoint_interval = hyperparams.UniformInt(lower=1, upper=sys.maxsize, default=1000, semantic_types=[
+        'https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='number of geocoded rows to buffer between writes to the checkpoint journal')
 
 class goat(TransformerPrimitiveBase[Inputs, Outputs, Hyperparams]):
     """
@@ -195,26 +203,54 @@ class goat(TransformerPrimitiveBase[Inputs, Outputs, Hyperparams]):
         outputs = inputs.remove_columns(target_column_idxs)
         out_df = pd.DataFrame(index=range(inputs.shape[0]),columns=target_columns_long_lat)
         
+        # resume from checkpoint journal of an interrupted run, if any
+        journal = None
+        done = collections.defaultdict(dict)
+        if self.hyperparams['checkpoint_dir'] is not None:
+            fingerprint = journal_fingerprint([(col, inputs[col]) for col in target_columns],
+                                              {'target_columns': list(target_column_idxs)})
+            journal = GeocodingJournal(self.hyperparams['checkpoint_dir'], fingerprint, self.hyperparams['checkpoint_interval'])
+            done = journal.load()
+            for i, rows in done.items():
+                for j, longlat in rows.items():
+                    out_df.iloc[j,2*i] = longlat[0] # longitude
+                    out_df.iloc[j,2*i+1] = longlat[1] # latitude
+
         # geocode each requested location
-        for i,ith_column in enumerate(target_columns):
-            j = 0
-            target_columns_long_lat[2*i]=target_columns_long_lat[2*i]+"_longitude"
-            target_columns_long_lat[2*i+1]=target_columns_long_lat[2*i+1]+"_latitude"
-            for location in inputs[ith_column]:
-                cache_ret = goat_cache.get(location)
-                if(cache_ret==-1):
-                    r = requests.get(address+'api?q='+location)
-                    tmp = self._decoder.decode(r.text)
-                    if self._is_geocoded(tmp):
-                        out_df.ix[j,2*i] = tmp['features'][0]['geometry']['coordinates'][0]
-                        out_df.ix[j,2*i+1] = tmp['features'][0]['geometry']['coordinates'][1]
-                        goat_cache.set(location,str(tmp['features'][0]['geometry']['coordinates']))
+        try:
+            for i,ith_column in enumerate(target_columns):
+                j = 0
+                target_columns_long_lat[2*i]=target_columns_long_lat[2*i]+"_longitude"
+                target_columns_long_lat[2*i+1]=target_columns_long_lat[2*i+1]+"_latitude"
+                for location in inputs[ith_column]:
+                    if j in done[i]:
+                        j=j+1
+                        continue
+                    cache_ret = goat_cache.get(location)
+                    if(cache_ret==-1):
+                        r = requests.get(address+'api?q='+location)
+                        tmp = self._decoder.decode(r.text)
+                        if self._is_geocoded(tmp):
+                            out_df.ix[j,2*i] = tmp['features'][0]['geometry']['coordinates'][0]
+                            out_df.ix[j,2*i+1] = tmp['features'][0]['geometry']['coordinates'][1]
+                            goat_cache.set(location,str(tmp['features'][0]['geometry']['coordinates']))
+                        else:
+                            goat_cache.set(location,'[float(\'nan\'), float(\'nan\')]')
                     else:
-                        goat_cache.set(location,'[float(\'nan\'), float(\'nan\')]')
-                else:
-                    out_df.ix[j,2*i] = eval(cache_ret)[0] # longitude
-                    out_df.ix[j,2*i+1] = eval(cache_ret)[1] # latitude
-                j=j+1
+                        out_df.ix[j,2*i] = eval(cache_ret)[0] # longitude
+                        out_df.ix[j,2*i+1] = eval(cache_ret)[1] # latitude
+                    if journal is not None:
+                        journal.record(i, j, [out_df.iloc[j,2*i], out_df.iloc[j,2*i+1]])
+                    j=j+1
+        finally:
+            # keep whatever was completed if geocoding is interrupted
+            if journal is not None:
+                try:
+                    journal.flush()
+                except OSError as error:
+                    logging.warning(f'Could not write checkpoint journal {journal.path}: {error}')
+        if journal is not None:
+            journal.finish()
         # need to cleanup by closing the server when done...
         PopenObj.kill()
 
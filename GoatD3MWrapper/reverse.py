@@ -8,6 +8,7 @@ import time
 import typing
 from json import JSONDecoder
 from typing import List, Tuple
+import logging
 
 from d3m.primitive_interfaces.transformer import TransformerPrimitiveBase
 from d3m.primitive_interfaces.base import CallResult
@@ -17,6 +18,7 @@ from d3m.metadata import hyperparams, base as metadata_base, params
 from d3m.container import DataFrame as d3m_DataFrame
 from common_primitives import utils as utils_cp
 from .forward import check_geocoding_server
+from .checkpoint import GeocodingJournal, journal_fingerprint
 
 
 __author__ = 'Distil'
@@ -59,6 +61,13 @@ class Hyperparams(hyperparams.Hyperparams):
     rampup_timeout = hyperparams.UniformInt(lower=1, upper=sys.maxsize, default=100, semantic_types=[
         'https://metadata.datadrivendiscovery.org/types/TuningParameter'],
         description='timeout, how much time to give elastic search database to startup, may vary based on infrastructure')
+    checkpoint_dir = hyperparams.Hyperparameter[typing.Union[str, None]](
+        default=None,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='directory in which to journal completed rows, so that an interrupted produce call can be resumed; disabled if None')
+    checkpoint_interval = hyperparams.UniformInt(lower=1, upper=sys.maxsize, default=1000, semantic_types=[
+        'https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='number of reverse-geocoded rows to buffer between writes to the checkpoint journal')
 
 
 class reverse_goat(TransformerPrimitiveBase[Inputs, Outputs, Hyperparams]):
@@ -192,30 +201,57 @@ class reverse_goat(TransformerPrimitiveBase[Inputs, Outputs, Hyperparams]):
         goat_cache = LRUCache(10)
         out_df = pd.DataFrame(index=range(inputs.shape[0]),columns=target_columns)
 
+        # resume from checkpoint journal of an interrupted run, if any
+        journal = None
+        done = collections.defaultdict(dict)
+        if self.hyperparams['checkpoint_dir'] is not None:
+            fingerprint = journal_fingerprint([(col, inputs[col]) for col in target_columns],
+                                              {'geocoding_resolution': self.hyperparams['geocoding_resolution']})
+            journal = GeocodingJournal(self.hyperparams['checkpoint_dir'], fingerprint, self.hyperparams['checkpoint_interval'])
+            done = journal.load()
+            for i, rows in done.items():
+                for j, location in rows.items():
+                    out_df.iloc[j,i] = location
+
         # reverse-geocode each requested location
-        for i,ith_column in enumerate(target_columns):
-            j = 0
-            for longlat in inputs[ith_column]:
-                cache_ret = goat_cache.get(longlat)
-                if(cache_ret==-1):
-                    r = requests.get(address+'reverse?lat='+str(longlat[0])+'&lon='+str(longlat[1]))
-                    tmp = self._decoder.decode(r.text)
-                    if len(tmp['features']) == 0:
-                        if self.hyperparams['geocoding_resolution'] == 'postcode':
-                            out_df.iloc[j,i] = float('nan')
-                        else:
-                            out_df.iloc[j,i] = ''
-                    elif self.hyperparams['geocoding_resolution'] not in tmp['features'][0]['properties'].keys():
-                        if self.hyperparams['geocoding_resolution'] == 'postcode':
-                            out_df.iloc[j,i] = float('nan')
+        try:
+            for i,ith_column in enumerate(target_columns):
+                j = 0
+                for longlat in inputs[ith_column]:
+                    if j in done[i]:
+                        j=j+1
+                        continue
+                    cache_ret = goat_cache.get(longlat)
+                    if(cache_ret==-1):
+                        r = requests.get(address+'reverse?lat='+str(longlat[0])+'&lon='+str(longlat[1]))
+                        tmp = self._decoder.decode(r.text)
+                        if len(tmp['features']) == 0:
+                            if self.hyperparams['geocoding_resolution'] == 'postcode':
+                                out_df.iloc[j,i] = float('nan')
+                            else:
+                                out_df.iloc[j,i] = ''
+                        elif self.hyperparams['geocoding_resolution'] not in tmp['features'][0]['properties'].keys():
+                            if self.hyperparams['geocoding_resolution'] == 'postcode':
+                                out_df.iloc[j,i] = float('nan')
+                            else:
+                                out_df.iloc[j,i] = '' 
                         else:
-                            out_df.iloc[j,i] = '' 
+                            out_df.iloc[j,i] = tmp['features'][0]['properties'][self.hyperparams['geocoding_resolution']]
+                        goat_cache.set(longlat,out_df.iloc[j,i])
                     else:
-                        out_df.iloc[j,i] = tmp['features'][0]['properties'][self.hyperparams['geocoding_resolution']]
-                    goat_cache.set(longlat,out_df.iloc[j,i])
-                else:
-                    out_df.iloc[j,i] = cache_ret
-                j=j+1
+                        out_df.iloc[j,i] = cache_ret
+                    if journal is not None:
+                        journal.record(i, j, out_df.iloc[j,i])
+                    j=j+1
+        finally:
+            # keep whatever was completed if reverse geocoding is interrupted
+            if journal is not None:
+                try:
+                    journal.flush()
+                except OSError as error:
+                    logging.warning(f'Could not write checkpoint journal {journal.path}: {error}')
+        if journal is not None:
+            journal.finish()
         # need to cleanup by closing the server when done...
         PopenObj.kill()
         # Build d3m-type dataframe
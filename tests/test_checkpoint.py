@@ -0,0 +1,117 @@
+import os
+import math
+import shutil
+import tempfile
+import unittest
+import importlib.util
+
+# load the journal module directly, the package __init__ pulls in d3m
+_spec = importlib.util.spec_from_file_location(
+    'checkpoint', os.path.join(os.path.dirname(__file__), '..', 'GoatD3MWrapper', 'checkpoint.py'))
+checkpoint = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(checkpoint)
+
+GeocodingJournal = checkpoint.GeocodingJournal
+journal_fingerprint = checkpoint.journal_fingerprint
+
+
+class GeocodingJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _journal(self, interval=2):
+        return GeocodingJournal(self.directory, 'abc', interval)
+
+    def _lines(self, journal):
+        with open(journal.path, 'rb') as f:
+            return f.read().splitlines(keepends=True)
+
+    def test_round_trip_two_columns(self):
+        journal = self._journal()
+        for j in range(3):
+            journal.record(0, j, [j, float('nan')])
+        for j in range(2):
+            journal.record(1, j, 'city' + str(j))
+        journal.flush()
+
+        done = self._journal().load()
+        self.assertEqual(sorted(done), [0, 1])
+        self.assertEqual(sorted(done[0]), [0, 1, 2])
+        self.assertEqual(done[0][2][0], 2)
+        self.assertTrue(math.isnan(done[0][2][1]))
+        self.assertEqual(done[1], {0: 'city0', 1: 'city1'})
+
+    def test_non_contiguous_run_starts_new_record(self):
+        journal = self._journal(interval=100)
+        journal.record(0, 0, 'a')
+        journal.record(0, 1, 'b')
+        journal.record(0, 5, 'c')
+        journal.flush()
+
+        self.assertEqual(len(self._lines(journal)), 2)
+        self.assertEqual(self._journal().load()[0], {0: 'a', 1: 'b', 5: 'c'})
+
+    def test_torn_trailing_record_is_truncated(self):
+        journal = self._journal()
+        journal.record(0, 0, 'a')
+        journal.record(0, 1, 'b')
+        size = os.path.getsize(journal.path)
+        with open(journal.path, 'a') as f:
+            f.write('{"column": 0, "sta')
+
+        self.assertEqual(self._journal().load()[0], {0: 'a', 1: 'b'})
+        self.assertEqual(os.path.getsize(journal.path), size)
+
+    def test_record_missing_newline_is_truncated_before_resume(self):
+        journal = self._journal(interval=4)
+        for j in range(4):
+            journal.record(0, j, j)
+        size = os.path.getsize(journal.path)
+        with open(journal.path, 'a') as f:
+            f.write('{"column": 0, "start": 4, "values": [4]}')
+
+        resumed = self._journal(interval=4)
+        self.assertEqual(sorted(resumed.load()[0]), [0, 1, 2, 3])
+        self.assertEqual(os.path.getsize(journal.path), size)
+        for j in range(4, 9):
+            resumed.record(0, j, j)
+        resumed.flush()
+
+        self.assertEqual(sorted(self._journal().load()[0]), list(range(9)))
+
+    def test_corrupt_record_is_skipped(self):
+        journal = self._journal(interval=1)
+        journal.record(0, 0, 'a')
+        with open(journal.path, 'a') as f:
+            f.write('not json\n')
+        journal.record(0, 2, 'c')
+
+        self.assertEqual(self._journal().load()[0], {0: 'a', 2: 'c'})
+
+    def test_finish_removes_journal(self):
+        journal = self._journal(interval=1)
+        journal.record(0, 0, 'a')
+        self.assertTrue(os.path.exists(journal.path))
+        journal.finish()
+        self.assertFalse(os.path.exists(journal.path))
+        self.assertEqual(self._journal().load(), {})
+
+
+class JournalFingerprintTest(unittest.TestCase):
+    def test_key_depends_on_inputs_and_hyperparams(self):
+        base = journal_fingerprint([('loc', ['Austin', 'Berlin'])], {'target_columns': [1]})
+        self.assertEqual(base, journal_fingerprint([('loc', ['Austin', 'Berlin'])], {'target_columns': [1]}))
+        self.assertNotEqual(base, journal_fingerprint([('loc', ['Austin', 'Paris'])], {'target_columns': [1]}))
+        self.assertNotEqual(base, journal_fingerprint([('loc', ['Austin', 'Berlin'])], {'target_columns': [2]}))
+
+    def test_key_depends_on_geocoding_resolution(self):
+        columns = [('new_col_lat', [[30.27, -97.74], [40.73, -73.98]])]
+        self.assertNotEqual(journal_fingerprint(columns, {'geocoding_resolution': 'city'}),
+                            journal_fingerprint(columns, {'geocoding_resolution': 'state'}))
+
+
+if __name__ == '__main__':
+    unittest.main()